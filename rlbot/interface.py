@@ -1,10 +1,13 @@
 import logging
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from enum import IntEnum
 from pathlib import Path
+from select import select
 from socket import IPPROTO_TCP, TCP_NODELAY, socket
+from struct import Struct
+from struct import error as StructError
 from threading import Thread
 from typing import Optional
 
@@ -16,6 +19,24 @@ MAX_SIZE_2_BYTES = 2**16 - 1
 RLBOT_SERVER_IP = "127.0.0.1"
 # The default port we can expect RLBotServer to be listening on
 RLBOT_SERVER_PORT = 23234
+# The in-place layout of a flatbuffer ControllerState struct
+CONTROLLER_STATE_STRUCT = Struct("<5f4?")
+
+
+def _controller_state_fields(
+    controller: flat.ControllerState,
+) -> tuple[float, float, float, float, float, bool, bool, bool, bool]:
+    return (
+        controller.throttle,
+        controller.steer,
+        controller.pitch,
+        controller.yaw,
+        controller.roll,
+        controller.jump,
+        controller.boost,
+        controller.handbrake,
+        controller.use_item,
+    )
 
 
 class SocketDataType(IntEnum):
@@ -89,6 +110,9 @@ class SocketRelay:
         self.connection_timeout = connection_timeout
         self.logger = get_logger("interface") if logger is None else logger
 
+        # Pre-encoded PlayerInput messages per player index (see `send_controller_states`)
+        self._player_input_frames: dict[int, Optional[tuple[bytearray, int]]] = {}
+
         self.socket = socket()
 
         # Allow sending packets before getting a response from core
@@ -101,39 +125,71 @@ class SocketRelay:
     def _int_to_bytes(val: int) -> bytes:
         return val.to_bytes(2, byteorder="big")
 
-    def _read_int(self) -> int:
-        return int.from_bytes(self._read_exact(2), "big")
+    def _read_int(self, *, in_message: bool = True) -> int:
+        return int.from_bytes(self._read_exact(2, in_message=in_message), "big")
 
-    def _read_exact(self, n: int) -> bytes:
+    def _read_exact(self, n: int, *, in_message: bool = True) -> bytes:
+        """
+        Reads exactly n bytes from the socket.
+        On a non-blocking socket, BlockingIOError is only raised if nothing has been read yet
+        and the bytes are not part of a message that has already been partially read.
+        Otherwise, we wait for the rest of the message to arrive.
+        """
         buff = bytearray(n)
         view = memoryview(buff)
 
         pos = 0
         while pos < n:
-            cr = self.socket.recv_into(view[pos:])
+            try:
+                cr = self.socket.recv_into(view[pos:])
+            except BlockingIOError:
+                if pos == 0 and not in_message:
+                    raise
+                select([self.socket], [], [])
+                continue
             if cr == 0:
                 raise EOFError
             pos += cr
         return bytes(buff)
 
     def read_message(self) -> SocketMessage:
-        type_int = self._read_int()
+        type_int = self._read_int(in_message=False)
         size = self._read_int()
         data = self._read_exact(size)
         return SocketMessage(SocketDataType(type_int), data)
 
-    def send_bytes(self, data: bytes, data_type: SocketDataType):
-        assert self.is_connected, "Connection has not been established"
-
+    def _frame_message(self, data: bytes, data_type: SocketDataType) -> bytes:
+        """
+        Prefixes the data with its type and size.
+        Returns empty bytes (and logs an error) if the data is too big to send.
+        """
         size = len(data)
         if size > MAX_SIZE_2_BYTES:
             self.logger.error(
                 "Couldn't send %s message because it was too big!", data_type.name
             )
-            return
+            return bytes()
 
-        message = self._int_to_bytes(data_type) + self._int_to_bytes(size) + data
-        self.socket.sendall(message)
+        return self._int_to_bytes(data_type) + self._int_to_bytes(size) + data
+
+    def send_bytes(self, data: bytes, data_type: SocketDataType):
+        assert self.is_connected, "Connection has not been established"
+
+        message = self._frame_message(data, data_type)
+        if message:
+            self.socket.sendall(message)
+
+    def send_bytes_batch(self, messages: Iterable[tuple[bytes, SocketDataType]]):
+        """
+        Sends multiple messages with a single write to the socket.
+        """
+        assert self.is_connected, "Connection has not been established"
+
+        batch = b"".join(
+            self._frame_message(data, data_type) for data, data_type in messages
+        )
+        if batch:
+            self.socket.sendall(batch)
 
     def send_init_complete(self):
         self.send_bytes(bytes(), SocketDataType.INIT_COMPLETE)
@@ -147,6 +203,77 @@ class SocketRelay:
     def send_player_input(self, player_input: flat.PlayerInput):
         self.send_bytes(player_input.pack(), SocketDataType.PLAYER_INPUT)
 
+    def _build_player_input_frame(self, index: int) -> Optional[tuple[bytearray, int]]:
+        """
+        Encodes a framed PlayerInput message for the given index once and finds the offset
+        of its ControllerState, so later messages only need to overwrite those bytes.
+        Returns None if the encoding does not have the expected layout.
+        """
+        template = self._frame_message(
+            flat.PlayerInput(index, flat.ControllerState()).pack(),
+            SocketDataType.PLAYER_INPUT,
+        )
+
+        probe_fields = (1.0, -1.0, 0.5, -0.5, 0.25, True, False, True, False)
+        probe = self._frame_message(
+            flat.PlayerInput(index, flat.ControllerState(*probe_fields)).pack(),
+            SocketDataType.PLAYER_INPUT,
+        )
+
+        offset = probe.find(CONTROLLER_STATE_STRUCT.pack(*probe_fields))
+        if len(template) != len(probe) or offset == -1:
+            return None
+
+        # Ensure that patching the template produces exactly what the flatbuffer builder would
+        frame = bytearray(template)
+        CONTROLLER_STATE_STRUCT.pack_into(frame, offset, *probe_fields)
+        if frame != probe:
+            return None
+
+        return bytearray(template), offset
+
+    def send_controller_states(
+        self, controllers: Iterable[tuple[int, Optional[flat.ControllerState]]]
+    ):
+        """
+        Sends a PlayerInput message for each pair of player index and controller state
+        with a single write to the socket.
+        The messages are pre-encoded once per index and only the controller states are
+        overwritten, which skips the flatbuffer builder.
+        """
+        assert self.is_connected, "Connection has not been established"
+
+        batch = bytearray()
+        for index, controller in controllers:
+            if index not in self._player_input_frames:
+                self._player_input_frames[index] = self._build_player_input_frame(index)
+
+            frame_and_offset = self._player_input_frames[index]
+            # Anything else than a ControllerState (e.g. None) is left for the
+            # flatbuffer builder to interpret
+            if frame_and_offset is not None and isinstance(
+                controller, flat.ControllerState
+            ):
+                frame, offset = frame_and_offset
+                try:
+                    CONTROLLER_STATE_STRUCT.pack_into(
+                        frame, offset, *_controller_state_fields(controller)
+                    )
+                    batch += frame
+                    continue
+                except (OverflowError, StructError):
+                    # E.g. a float outside of float32 range, which the flatbuffer builder
+                    # saturates to inf instead of raising
+                    pass
+
+            batch += self._frame_message(
+                flat.PlayerInput(index, controller).pack(),
+                SocketDataType.PLAYER_INPUT,
+            )
+
+        if batch:
+            self.socket.sendall(batch)
+
     def send_game_state(self, game_state: flat.DesiredGameState):
         self.send_bytes(game_state.pack(), SocketDataType.DESIRED_GAME_STATE)
 
@@ -157,6 +284,15 @@ class SocketRelay:
         flatbuffer = flat.RemoveRenderGroup(group_id).pack()
         self.send_bytes(flatbuffer, SocketDataType.REMOVE_RENDER_GROUP)
 
+    def remove_render_groups(self, group_ids: Iterable[int]):
+        self.send_bytes_batch(
+            (
+                flat.RemoveRenderGroup(group_id).pack(),
+                SocketDataType.REMOVE_RENDER_GROUP,
+            )
+            for group_id in group_ids
+        )
+
     def stop_match(self, shutdown_server: bool = False):
         flatbuffer = flat.StopCommand(shutdown_server).pack()
         self.send_bytes(flatbuffer, SocketDataType.STOP_COMMAND)
@@ -280,7 +416,8 @@ class SocketRelay:
         """
         assert self.is_connected, "Connection has not been established"
         try:
-            self.socket.setblocking(blocking)
+            if self.socket.getblocking() != blocking:
+                self.socket.setblocking(blocking)
             incoming_message = self.read_message()
             try:
                 return self.handle_incoming_message(incoming_message)
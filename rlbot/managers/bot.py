@@ -1,5 +1,4 @@
 import os
-from traceback import print_exc
 from typing import Optional
 
 from rlbot import flat
@@ -99,11 +98,12 @@ class Bot:
 
         try:
             self.initialize()
-        except Exception as e:
+        except Exception:
             self.logger.critical(
-                "Bot %s failed to initialize due the following error: %s", self.name, e
+                "Bot %s failed to initialize due the following error:",
+                self.name,
+                exc_info=True,
             )
-            print_exc()
             exit()
 
         self._initialized_bot = True
@@ -144,13 +144,11 @@ class Bot:
 
         try:
             controller = self.get_output(packet)
-        except Exception as e:
-            self.logger.error(
-                "Bot %s encountered an error while processing game packet: %s",
+        except Exception:
+            self.logger.exception(
+                "Bot %s encountered an error while processing game packet:",
                 self.name,
-                e,
             )
-            print_exc()
             return
 
         player_input = flat.PlayerInput(self.index, controller)
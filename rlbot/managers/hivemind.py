@@ -1,6 +1,6 @@
+import asyncio
 import os
 from logging import Logger
-from traceback import print_exc
 from typing import Optional
 
 from rlbot import flat
@@ -24,38 +24,71 @@ class Hivemind:
     `initialize` as their values are not ready in the constructor.
     """
 
-    _logger = DEFAULT_LOGGER
-    loggers: list[Logger] = []
-
-    team: int = -1
-    indices: list[int] = []
-    names: list[str] = []
-    spawn_ids: list[int] = []
-
-    match_config = flat.MatchConfiguration()
+    __slots__ = (
+        "_logger",
+        "loggers",
+        "team",
+        "indices",
+        "names",
+        "spawn_ids",
+        "_max_index",
+        "match_config",
+        "field_info",
+        "ball_prediction",
+        "_initialized_bot",
+        "_has_match_settings",
+        "_has_field_info",
+        "_has_player_mapping",
+        "_latest_packet",
+        "_latest_prediction",
+        "_game_interface",
+        "renderer",
+    )
+
+    loggers: list[Logger]
+
+    team: int
+    indices: list[int]
+    names: list[str]
+    spawn_ids: list[int]
+
+    match_config: flat.MatchConfiguration
     """
     Contains info about what map you're on, game mode, mutators, etc.
     """
 
-    field_info = flat.FieldInfo()
+    field_info: flat.FieldInfo
     """
     Contains info about the map, such as the locations of boost pads and goals.
     """
 
-    ball_prediction = flat.BallPrediction()
+    ball_prediction: flat.BallPrediction
     """
     A simulated prediction of the ball's trajectory including collisions with field geometry (but not cars).
     """
 
-    _initialized_bot = False
-    _has_match_settings = False
-    _has_field_info = False
-    _has_player_mapping = False
+    def __init__(self, default_agent_id: Optional[str] = None):
+        self._logger = DEFAULT_LOGGER
+        self.loggers = []
 
-    _latest_packet: Optional[flat.GamePacket] = None
-    _latest_prediction = flat.BallPrediction()
+        self.team = -1
+        self.indices = []
+        self.names = []
+        self.spawn_ids = []
+        self._max_index = -1
+
+        self.match_config = flat.MatchConfiguration()
+        self.field_info = flat.FieldInfo()
+        self.ball_prediction = flat.BallPrediction()
+
+        self._initialized_bot = False
+        self._has_match_settings = False
+        self._has_field_info = False
+        self._has_player_mapping = False
+
+        self._latest_packet: Optional[flat.GamePacket] = None
+        self._latest_prediction = flat.BallPrediction()
 
-    def __init__(self, default_agent_id: Optional[str] = None):
         agent_id = os.environ.get("RLBOT_AGENT_ID") or default_agent_id
 
         if agent_id is None:
@@ -91,23 +124,26 @@ class Hivemind:
         ):
             return
 
-        # Search match settings for our spawn ids
+        # Search match settings for our spawn ids.
+        # Names are looked up in the order of our spawn ids, so they line up with `indices`
+        players_by_spawn_id = {
+            player.spawn_id: player
+            for player in self.match_config.player_configurations
+        }
         for spawn_id in self.spawn_ids:
-            for player in self.match_config.player_configurations:
-                if player.spawn_id == spawn_id:
-                    self.names.append(player.name)
-                    self.loggers.append(get_logger(player.name))
-                    break
+            player = players_by_spawn_id.get(spawn_id)
+            if player is not None:
+                self.names.append(player.name)
+                self.loggers.append(get_logger(player.name))
 
         try:
             self.initialize()
-        except Exception as e:
+        except Exception:
             self._logger.critical(
-                "Hivemind (of %s) failed to initialize due the following error: %s",
+                "Hivemind (of %s) failed to initialize due the following error:",
                 "Unknown_Bots" if len(self.names) == 0 else ", ".join(self.names),
-                e,
+                exc_info=True,
             )
-            print_exc()
             exit()
 
         self._initialized_bot = True
@@ -130,6 +166,7 @@ class Hivemind:
         for controllable in player_mappings.controllables:
             self.spawn_ids.append(controllable.spawn_id)
             self.indices.append(controllable.index)
+        self._max_index = max(self.indices, default=-1)
 
         self._has_player_mapping = True
         self._try_initialize()
@@ -141,53 +178,79 @@ class Hivemind:
         self._latest_packet = packet
 
     def _packet_processor(self, packet: flat.GamePacket):
-        if len(packet.players) <= self.indices[-1]:
+        if len(packet.players) <= self._max_index:
             return
 
         self.ball_prediction = self._latest_prediction
 
         try:
-            controller = self.get_outputs(packet)
-        except Exception as e:
-            self._logger.error(
-                "Hivemind (of %s) encountered an error while processing game packet: %s",
+            controllers = self.get_outputs(packet)
+        except Exception:
+            self._logger.exception(
+                "Hivemind (of %s) encountered an error while processing game packet:",
                 ", ".join(self.names),
-                e,
             )
-            print_exc()
             return
 
-        for index, controller in controller.items():
-            if index not in self.indices:
+        # Local alias avoids repeated attribute lookups in the per-bot loop
+        indices = self.indices
+        for index in controllers:
+            if index not in indices:
                 self._logger.warning(
                     "Hivemind produced controller state for a bot index that is does not"
                     "control (index %s). It controls %s",
                     index,
-                    ", ".join(map(str, self.indices)),
+                    ", ".join(map(str, indices)),
                 )
-            player_input = flat.PlayerInput(index, controller)
-            self._game_interface.send_player_input(player_input)
-
-    def _run(self):
-        running = True
-
-        while running:
-            # If there might be more messages,
-            # check for another one with blocking=False
-            # if there are no more messages, process the latest packet
-            # then wait for the next message with blocking=True
-            match self._game_interface.handle_incoming_messages(
-                blocking=self._latest_packet is None
-            ):
+
+        # Send the inputs for all of the hivemind's bots in a single write
+        self._game_interface.send_controller_states(controllers.items())
+
+    def _handle_readable(self, terminated: asyncio.Future[None]):
+        if terminated.done():
+            return
+
+        # Errors raised in a reader callback would otherwise only be logged by the event loop,
+        # so pass them on to `_run` which re-raises them
+        try:
+            self._drain_and_process(terminated)
+        except BaseException as e:
+            if not terminated.done():
+                terminated.set_exception(e)
+
+    def _drain_and_process(self, terminated: asyncio.Future[None]):
+        # The socket is readable, so drain all queued messages
+        # and then process the latest packet
+        handle_incoming_messages = self._game_interface.handle_incoming_messages
+        while True:
+            match handle_incoming_messages(blocking=False):
                 case MsgHandlingResult.TERMINATED:
-                    running = False
+                    terminated.set_result(None)
+                    return
                 case MsgHandlingResult.NO_INCOMING_MSGS:
-                    if self._latest_packet is not None:
-                        self._packet_processor(self._latest_packet)
-                        self._latest_packet = None
+                    break
                 case _:
                     pass
 
+        if self._latest_packet is not None:
+            self._packet_processor(self._latest_packet)
+            self._latest_packet = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        terminated: asyncio.Future[None] = loop.create_future()
+
+        # Sleep in the event loop's selector until the socket is readable
+        # instead of waiting inside of a blocking recv.
+        # The socket and its fd only need to be set up once
+        self._game_interface.socket.setblocking(False)
+        fd = self._game_interface.socket.fileno()
+        loop.add_reader(fd, self._handle_readable, terminated)
+        try:
+            await terminated
+        finally:
+            loop.remove_reader(fd)
+
     def run(
         self,
         *,
@@ -209,7 +272,9 @@ class Hivemind:
                 rlbot_server_port=rlbot_server_port,
             )
 
-            self._run()
+            # The proactor event loop (default on Windows) does not support `add_reader`
+            with asyncio.Runner(loop_factory=asyncio.SelectorEventLoop) as runner:
+                runner.run(self._run())
         finally:
             self.retire()
             del self._game_interface
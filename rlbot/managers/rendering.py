@@ -1,13 +1,26 @@
-from collections.abc import Callable, Sequence
-from typing import Optional
+from collections.abc import Callable, Iterable, Sequence
 
 from rlbot import flat
 from rlbot.interface import SocketRelay
 from rlbot.utils.logging import get_logger
 
-MAX_INT = 2147483647 // 2
 DEFAULT_GROUP_ID = "default"
 
+TRANSPARENT = flat.Color(a=0)
+BLACK = flat.Color()
+WHITE = flat.Color(255, 255, 255)
+GREY = GRAY = flat.Color(128, 128, 128)
+BLUE = flat.Color(0, 0, 255)
+RED = flat.Color(255, 0, 0)
+GREEN = flat.Color(0, 128, 0)
+LIME = flat.Color(0, 255, 0)
+YELLOW = flat.Color(255, 255, 0)
+ORANGE = flat.Color(225, 128, 0)
+CYAN = flat.Color(0, 255, 255)
+PINK = flat.Color(255, 0, 255)
+PURPLE = flat.Color(128, 0, 128)
+TEAL = flat.Color(0, 128, 128)
+
 
 def _get_anchor(
     anchor: flat.RenderAnchor | flat.BallAnchor | flat.CarAnchor | flat.Vector3,
@@ -29,28 +42,48 @@ class Renderer:
     An interface to the debug rendering features.
     """
 
-    transparent = flat.Color(a=0)
-    black = flat.Color()
-    white = flat.Color(255, 255, 255)
-    grey = gray = flat.Color(128, 128, 128)
-    blue = flat.Color(0, 0, 255)
-    red = flat.Color(255, 0, 0)
-    green = flat.Color(0, 128, 0)
-    lime = flat.Color(0, 255, 0)
-    yellow = flat.Color(255, 255, 0)
-    orange = flat.Color(225, 128, 0)
-    cyan = flat.Color(0, 255, 255)
-    pink = flat.Color(255, 0, 255)
-    purple = flat.Color(128, 0, 128)
-    teal = flat.Color(0, 128, 128)
+    transparent = TRANSPARENT
+    black = BLACK
+    white = WHITE
+    grey = gray = GRAY
+    blue = BLUE
+    red = RED
+    green = GREEN
+    lime = LIME
+    yellow = YELLOW
+    orange = ORANGE
+    cyan = CYAN
+    pink = PINK
+    purple = PURPLE
+    teal = TEAL
 
     _logger = get_logger("renderer")
 
-    _used_group_ids: set[int] = set()
-    _group_id: Optional[int] = None
-    _current_renders: list[flat.RenderMessage] = []
+    __slots__ = (
+        "_group_ids",
+        "_used_group_ids",
+        "_rendering",
+        "_group_id",
+        "_current_renders",
+        "_render_group",
+        "_remove_render_group",
+        "_remove_render_groups",
+    )
 
     def __init__(self, game_interface: SocketRelay):
+        self._group_ids: dict[str, int] = {}
+        self._used_group_ids: list[int] = []
+        self._rendering = False
+        self._group_id = 0
+        self._current_renders: list[
+            flat.String2D
+            | flat.String3D
+            | flat.Line3D
+            | flat.PolyLine3D
+            | flat.Rect2D
+            | flat.Rect3D
+        ] = []
+
         self._render_group: Callable[[flat.RenderGroup], None] = (
             game_interface.send_render_group
         )
@@ -59,6 +92,10 @@ class Renderer:
             game_interface.remove_render_group
         )
 
+        self._remove_render_groups: Callable[[Iterable[int]], None] = (
+            game_interface.remove_render_groups
+        )
+
     @staticmethod
     def create_color(red: int, green: int, blue: int, alpha: int = 255) -> flat.Color:
         return flat.Color(red, green, blue, alpha)
@@ -70,28 +107,34 @@ class Renderer:
         or a secondary color (cyan or red) if `alt_color` is True.
         """
         if team == 0:
-            return Renderer.cyan if alt_color else Renderer.blue
+            return CYAN if alt_color else BLUE
         elif team == 1:
-            return Renderer.red if alt_color else Renderer.orange
+            return RED if alt_color else ORANGE
 
-        return Renderer.gray if alt_color else Renderer.white
+        return GRAY if alt_color else WHITE
 
-    @staticmethod
-    def _get_group_id(group_id: str) -> int:
-        return hash(str(group_id).encode("utf-8")) % MAX_INT
+    def _get_group_id(self, group_id: str) -> int:
+        """
+        Get the id of the render group with the given name.
+        Ids are handed out densely in order of first use, starting from 1.
+        """
+        int_id = self._group_ids.get(group_id)
+        if int_id is None:
+            int_id = self._group_ids[group_id] = len(self._group_ids) + 1
+        return int_id
 
     def begin_rendering(self, group_id: str = DEFAULT_GROUP_ID):
         """
         Begins a new render group. All render messages added after this call will be part of this group.
         """
-        if self.is_rendering() and len(self._current_renders) > 0:
+        if self._rendering and self._current_renders:
             self._logger.error(
                 "begin_rendering was called twice without end_rendering."
             )
             return
 
-        self._group_id = Renderer._get_group_id(group_id)
-        self._used_group_ids.add(self._group_id)
+        self._rendering = True
+        self._group_id = self._get_group_id(group_id)
 
     def end_rendering(self):
         """
@@ -99,40 +142,51 @@ class Renderer:
         `begin_rendering` must be called before this is called, and the render group will contain
         all render messages queued between these two calls.
         """
-        if self._group_id is None:
-            if len(self._current_renders) > 0:
+        if not self._rendering:
+            if self._current_renders:
                 self._logger.error(
                     "`end_rendering` was called without a call to `begin_rendering` first."
                 )
             return
 
-        self._render_group(flat.RenderGroup(self._current_renders, self._group_id))
-        self._current_renders.clear()
-        self._group_id = None
+        if self._current_renders:
+            # Renders are queued unwrapped and only wrapped in RenderMessages here, once per group.
+            # RenderMessage accepts any render type positionally, so it can be mapped directly
+            messages = list(map(flat.RenderMessage, self._current_renders))
+            self._render_group(flat.RenderGroup(messages, self._group_id))
+            if self._group_id not in self._used_group_ids:
+                self._used_group_ids.append(self._group_id)
+            self._current_renders.clear()
+        elif self._group_id in self._used_group_ids:
+            # An empty group replaces what was drawn previously, which is the same as removing it
+            self._remove_render_group(self._group_id)
+            self._used_group_ids.remove(self._group_id)
+
+        self._rendering = False
 
     def clear_render_group(self, group_id: str = DEFAULT_GROUP_ID):
         """
         Clears all rendering of the provided group.
         Note: It is not possible to clear render groups of other bots.
         """
-        group_id_hash = Renderer._get_group_id(group_id)
-        self._remove_render_group(group_id_hash)
-        self._used_group_ids.discard(group_id_hash)
+        int_id = self._get_group_id(group_id)
+        self._remove_render_group(int_id)
+        if int_id in self._used_group_ids:
+            self._used_group_ids.remove(int_id)
 
     def clear_all_render_groups(self):
         """
         Clears all rendering.
         Note: This does not clear render groups created by other bots.
         """
-        for group_id in self._used_group_ids:
-            self._remove_render_group(group_id)
+        self._remove_render_groups(self._used_group_ids)
         self._used_group_ids.clear()
 
     def is_rendering(self):
         """
         Returns True if `begin_rendering` has been called without a corresponding call to `end_rendering`.
         """
-        return self._group_id is not None
+        return self._rendering
 
     def draw(
         self,
@@ -145,14 +199,14 @@ class Renderer:
             | flat.Rect3D
         ),
     ):
-        if not self.is_rendering():
+        if not self._rendering:
             self._logger.error(
                 "Attempted to draw without a render group."
                 "Please call `begin_rendering` first, and then `end_rendering` after."
             )
             return
 
-        self._current_renders.append(flat.RenderMessage(render))
+        self._current_renders.append(render)
 
     def draw_line_3d(
         self,
@@ -181,7 +235,7 @@ class Renderer:
         anchor: flat.RenderAnchor | flat.BallAnchor | flat.CarAnchor | flat.Vector3,
         scale: float,
         foreground: flat.Color,
-        background: flat.Color = flat.Color(a=0),
+        background: flat.Color = TRANSPARENT,
         h_align: flat.TextHAlign = flat.TextHAlign.Left,
         v_align: flat.TextVAlign = flat.TextVAlign.Top,
     ):
@@ -208,7 +262,7 @@ class Renderer:
         y: float,
         scale: float,
         foreground: flat.Color,
-        background: flat.Color = flat.Color(a=0),
+        background: flat.Color = TRANSPARENT,
         h_align: flat.TextHAlign = flat.TextHAlign.Left,
         v_align: flat.TextVAlign = flat.TextVAlign.Top,
     ):
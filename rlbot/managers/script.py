@@ -1,5 +1,4 @@
 import os
-from traceback import print_exc
 from typing import Optional
 
 from rlbot import flat
@@ -74,13 +73,12 @@ class Script:
 
         try:
             self.initialize()
-        except Exception as e:
+        except Exception:
             self.logger.critical(
-                "Script %s failed to initialize due the following error: %s",
+                "Script %s failed to initialize due the following error:",
                 self.name,
-                e,
+                exc_info=True,
             )
-            print_exc()
             exit()
 
         self._initialized_script = True
@@ -119,11 +117,8 @@ class Script:
 
         try:
             self.handle_packet(packet)
-        except Exception as e:
-            self.logger.error(
-                "Script %s encountered an error to RLBot: %s", self.name, e
-            )
-            print_exc()
+        except Exception:
+            self.logger.exception("Script %s encountered an error to RLBot:", self.name)
 
     def _run(self):
         running = True
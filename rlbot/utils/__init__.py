@@ -1,7 +1,10 @@
-from typing import Optional
+from collections.abc import Callable
+from typing import Optional, TypeVar
 
 from rlbot import flat
 
+_T = TypeVar("_T")
+
 
 def fill_desired_game_state(
     balls: dict[int, flat.DesiredBallState] = {},
@@ -20,15 +23,21 @@ def fill_desired_game_state(
     )
 
     if balls:
-        max_entry = max(balls.keys())
-        default_ball = flat.DesiredBallState()
-        game_state.ball_states = [
-            balls.get(i, default_ball) for i in range(max_entry + 1)
-        ]
+        game_state.ball_states = _fill_states(balls, flat.DesiredBallState)
 
     if cars:
-        max_entry = max(cars.keys())
-        default_car = flat.DesiredCarState()
-        game_state.car_states = [cars.get(i, default_car) for i in range(max_entry + 1)]
+        game_state.car_states = _fill_states(cars, flat.DesiredCarState)
 
     return game_state
+
+
+def _fill_states(states: dict[int, _T], empty: Callable[[], _T]) -> list[_T]:
+    max_entry = max(states)
+    if len(states) == max_entry + 1:
+        # All indices are present, no gaps to fill
+        return [states[i] for i in range(max_entry + 1)]
+
+    # One empty state is shared by the gaps of this call only,
+    # since the states are mutable and returned to the caller
+    default = empty()
+    return [states.get(i, default) for i in range(max_entry + 1)]
@@ -0,0 +1,71 @@
+import socket
+import unittest
+from typing import Optional
+
+from rlbot import flat
+from rlbot.interface import SocketDataType, SocketRelay
+
+
+class SendControllerStatesTest(unittest.TestCase):
+    def setUp(self):
+        self.relay = SocketRelay("test")
+        self.relay.socket.close()
+        self.relay.socket, self.server = socket.socketpair()
+        self.relay.is_connected = True
+
+    def tearDown(self):
+        self.server.close()
+
+    def _expected(
+        self, controllers: list[tuple[int, Optional[flat.ControllerState]]]
+    ) -> bytes:
+        return b"".join(
+            self.relay._frame_message(
+                flat.PlayerInput(index, controller).pack(),
+                SocketDataType.PLAYER_INPUT,
+            )
+            for index, controller in controllers
+        )
+
+    def _received(self, size: int) -> bytes:
+        data = b""
+        while len(data) < size:
+            data += self.server.recv(size - len(data))
+        return data
+
+    def test_matches_flatbuffer_encoding(self):
+        controllers = [
+            (0, flat.ControllerState(1, -1, 0.3, 0.7, -0.2, True, False, True, False)),
+            (1, flat.ControllerState(steer=0.5, boost=True)),
+            (300, flat.ControllerState(throttle=-1, handbrake=True, use_item=True)),
+        ]
+
+        # Send twice so the second round reuses the pre-encoded messages
+        for _ in range(2):
+            expected = self._expected(controllers)
+            self.relay.send_controller_states(controllers)
+            self.assertEqual(self._received(len(expected)), expected)
+
+    def test_out_of_range_float_falls_back_to_flatbuffer_encoding(self):
+        controllers = [
+            (0, flat.ControllerState(throttle=1e39)),
+            (1, flat.ControllerState(steer=1)),
+        ]
+
+        expected = self._expected(controllers)
+        self.relay.send_controller_states(controllers)
+        self.assertEqual(self._received(len(expected)), expected)
+
+    def test_none_controller_falls_back_to_flatbuffer_encoding(self):
+        controllers = [
+            (0, None),
+            (1, flat.ControllerState(steer=1)),
+        ]
+
+        expected = self._expected(controllers)
+        self.relay.send_controller_states(controllers)
+        self.assertEqual(self._received(len(expected)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()